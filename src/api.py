@@ -1,29 +1,44 @@
+from typing import Any, Literal
 from fastapi import FastAPI, UploadFile, File
 from pdf_parser import parse_bank_statement
-import io
+import asyncio
+import shutil
+import tempfile
 
 app = FastAPI(title="PDF Bank Statement Parser", version="1.0.0")
 
+# Copy uploads to disk in 1 MiB chunks rather than reading the whole body at once
+UPLOAD_CHUNK_SIZE = 1 << 20
+
 @app.post("/parse")
-async def parse_pdf(file: UploadFile = File(...)):
-    # Read uploaded bytes into a BytesIO for pdfplumber
-    data = await file.read()
-    buf = io.BytesIO(data)
-    df, unparsed, _ = parse_bank_statement(buf)
+async def parse_pdf(
+    file: UploadFile = File(...),
+    backend: Literal["pdfplumber", "pdfium"] = "pdfplumber",
+) -> dict[str, Any]:
+    with tempfile.NamedTemporaryFile(suffix=".pdf") as tmp:
+        # Spool the upload straight to a temp file so the PDF is held once, on disk
+        await asyncio.to_thread(shutil.copyfileobj, file.file, tmp, UPLOAD_CHUNK_SIZE)
+        tmp.flush()
+        # Parsing is CPU heavy; run it off the event loop
+        df, unparsed, _ = await asyncio.to_thread(
+            parse_bank_statement, tmp.name, backend
+        )
     if df.empty:
         return {"transactions": [], "unparsed_sample": unparsed[:50], "total_unparsed": len(unparsed)}
-    # Convert DataFrame to JSON-serializable structure
-    records = []
-    for row in df.to_dict(orient="records"):
-        # Ensure dates are strings
-        d = row.get("date")
-        if d is not None:
-            row["date"] = str(d)
-        records.append(row)
+    # Stringify dates in one vectorized pass; missing dates stay null
+    dates = df["date"].astype("string")
+    df = df.assign(date=dates.astype(object).where(dates.notna(), None))
+    accounts = sorted(
+        df[["account_number", "account_type"]]
+        .drop_duplicates()
+        .itertuples(index=False, name=None)
+    )
+    # The declared return type lets FastAPI serialize straight to JSON bytes via
+    # Pydantic, skipping jsonable_encoder; NaN floats are written as null
     return {
-        "transactions": records,
-        "transaction_count": len(records),
-        "accounts": sorted({(r.get("account_number"), r.get("account_type")) for r in records}),
+        "transactions": df.to_dict(orient="records"),
+        "transaction_count": len(df),
+        "accounts": accounts,
         "unparsed_sample": unparsed[:50],
         "total_unparsed": len(unparsed),
     }
@@ -5,16 +5,18 @@ Features:
   - Basic filtering (account type, search description substring).
   - Download full or filtered CSV.
   - Optional debug panels: unparsed lines, balance mismatches, raw line sample.
-  - Caching of parse results per file content to speed iterative inspection.
+  - Caching of parse results per file content hash to speed iterative inspection.
 """
 
 from __future__ import annotations
 
 import io
-import hashlib
+import re
 from typing import Tuple
 
+import numpy as np
 import streamlit as st
+import xxhash
 
 from pdf_parser import parse_bank_statement, compute_balance_mismatches
 
@@ -22,23 +24,41 @@ from pdf_parser import parse_bank_statement, compute_balance_mismatches
 # ----------------------------- Utility Layer ----------------------------- #
 
 
-def _file_hash(file_like) -> str:
-    """Return a short hash of the uploaded file bytes for cache keying."""
-    pos = file_like.tell()
-    file_like.seek(0)
-    data = file_like.read()
-    file_like.seek(pos)
-    return hashlib.sha256(data).hexdigest()[:16]
+def _file_hash_from_bytes(data: bytes) -> str:
+    """Return a short hash of the uploaded file bytes for cache keying.
+
+    Hashes the bytes already held for parsing, so no second copy is read. The
+    key only addresses content within this process, so a fast non-cryptographic
+    hash (XXH3, 64-bit -> 16 hex chars) is sufficient.
+    """
+    return xxhash.xxh3_64_hexdigest(data)
 
 
-@st.cache_data(show_spinner=False)
-def _cached_parse(content_bytes: bytes) -> Tuple:
+# Entries are shared by all sessions and hold the frame plus every raw line; cap the
+# count and expire idle statements so the cache doesn't grow for the life of the server
+@st.cache_resource(show_spinner=False, max_entries=16, ttl="1h")
+def _cached_parse(file_hash: str, backend: str, _content_bytes: bytes) -> Tuple:
     """Cache wrapper around parse_bank_statement.
 
-    We pass raw bytes to keep the cache key independent of filename.
+    Keyed on the content hash and backend only: the leading underscore keeps
+    Streamlit from hashing the raw bytes on every rerun, and cache_resource
+    hands back the stored result without pickling it. Callers must not mutate it.
+    """
+    bio = io.BytesIO(_content_bytes)
+    return parse_bank_statement(bio, backend=backend)
+
+
+# Small cap: each distinct filter (every search keystroke) would otherwise keep its
+# own full CSV payload for the life of the server
+@st.cache_data(show_spinner=False, max_entries=8)
+def _csv_bytes(df) -> bytes:
+    """Encode a frame as UTF-8 CSV, cached so reruns don't rebuild the download.
+
+    to_csv writes straight into a binary buffer, skipping the str -> bytes copy.
     """
-    bio = io.BytesIO(content_bytes)
-    return parse_bank_statement(bio)
+    buf = io.BytesIO()
+    df.to_csv(buf, index=False, encoding="utf-8")
+    return buf.getvalue()
 
 
 # ----------------------------- UI Components ----------------------------- #
@@ -68,7 +88,8 @@ def _render_metrics(df):
 def _filter_dataframe(df):
     if df.empty:
         return df
-    f_df = df.copy()
+    # Boolean indexing below returns new frames, so the unfiltered path needs no copy
+    f_df = df
     if "account_type" in f_df.columns:
         types = sorted(f_df["account_type"].dropna().unique())
         chosen = st.multiselect(
@@ -80,7 +101,17 @@ def _filter_dataframe(df):
         "Description contains", placeholder="e.g. AMAZON", key="filter_desc"
     )
     if q:
-        f_df = f_df[f_df["description"].str.contains(q, case=False, na=False)]
+        # One compiled, case-insensitive literal pattern with its bound search
+        search = re.compile(re.escape(q), re.IGNORECASE).search
+        mask = np.fromiter(
+            (
+                isinstance(s, str) and search(s) is not None
+                for s in f_df["description"].to_numpy(dtype=object)
+            ),
+            dtype=bool,
+            count=len(f_df),
+        )
+        f_df = f_df[mask]
     return f_df
 
 
@@ -124,6 +155,13 @@ def main():
         uploaded = st.file_uploader(
             "PDF statement", type=["pdf"], accept_multiple_files=False, key="uploader"
         )
+        backend = st.selectbox(
+            "Text extraction",
+            ["pdfplumber", "pdfium"],
+            key="backend",
+            help="pdfium is faster but keeps the PDF's drawing order, which can "
+            "split tables drawn column by column.",
+        )
         parse_btn = st.button(
             "Parse / Refresh", type="primary", use_container_width=True
         )
@@ -138,23 +176,25 @@ def main():
 
     ss = st.session_state
     file_bytes = uploaded.getvalue()
-    file_hash = _file_hash(io.BytesIO(file_bytes))
+    file_hash = _file_hash_from_bytes(file_bytes)
     need_parse = (
         parse_btn
         or ("_parsed_hash" not in ss)
         or (ss.get("_parsed_hash") != file_hash)
+        or (ss.get("_parsed_backend") != backend)
         or ("parsed_df" not in ss)
     )
 
     if need_parse:
         with st.spinner("Parsing PDF ..."):
-            df, unparsed, raw_lines = _cached_parse(file_bytes)
+            df, unparsed, raw_lines = _cached_parse(file_hash, backend, file_bytes)
         ss.update(
             {
                 "parsed_df": df,
                 "unparsed_lines": unparsed,
                 "raw_lines": raw_lines,
                 "_parsed_hash": file_hash,
+                "_parsed_backend": backend,
             }
         )
     else:
@@ -200,7 +240,7 @@ def main():
     with col_dl1:
         st.download_button(
             "Download (filtered CSV)",
-            data=filtered_df[display_cols].to_csv(index=False).encode("utf-8"),
+            data=_csv_bytes(filtered_df[display_cols]),
             file_name="statement_filtered.csv",
             mime="text/csv",
             use_container_width=True,
@@ -208,7 +248,7 @@ def main():
     with col_dl2:
         st.download_button(
             "Download (full CSV)",
-            data=df[core_cols].to_csv(index=False).encode("utf-8"),
+            data=_csv_bytes(df[core_cols]),
             file_name="statement_full.csv",
             mime="text/csv",
             use_container_width=True,
@@ -1,10 +1,23 @@
+import functools
+import multiprocessing
+import os
 import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, date
 from typing import List, Tuple, Union
+import numpy as np
 import pandas as pd
 import pdfplumber
+import pypdfium2 as pdfium
 from collections import Counter
 
+from pdf_parser_kernels import classify_trailing, normalize_number
+
+# PDFium is not thread-safe; the API (asyncio.to_thread) and Streamlit sessions call
+# in from several threads, so all in-process PDFium use is serialized
+_PDFIUM_LOCK = threading.Lock()
+
 
 STATEMENT_PERIOD_RX = re.compile(
     r"""
@@ -30,6 +43,9 @@ DATE_START_RX = re.compile(
     re.VERBOSE,
 )
 
+# Cheap "line starts with a date" test used per line (wrapped-line merge, unparsed check)
+_DATE_PREFIX_RX = re.compile(r"^\d{1,2}[/-]\d{1,2}(?:[/-]\d{2,4})?\b")
+
 AMOUNT_TOKEN_RX = re.compile(
     r"""
     ^ 
@@ -51,20 +67,8 @@ YEAR_IN_RANGE_RX = re.compile(
     re.VERBOSE,
 )
 
-ACCOUNT_HEADER_RX = re.compile(
-    r"""
-    ^
-    (?P<name>
-        [A-Za-z&'./-]+
-        (?:\s+[A-Za-z&'./-]+)*
-    )
-    \s* - \s*
-    (?P<number>\d{6,})\b
-    """,
-    re.VERBOSE,
-)
-
-
+# Matches a header at the start of a line or inline; search() finds a leading
+# header first since it tries position 0 before any other.
 ACCOUNT_HEADER_INLINE_RX = re.compile(
     r"""
     (?P<name>
@@ -93,10 +97,11 @@ HEADER_FOOTER_PATTERNS_RX = [
 ]
 
 
-SKIP_DESC = ["Beginning Balance", "Ending Balance"]
-SKIP_CONTAINS = ["Average Daily Balance", "Beginning Balnce", "Ending Balance"]
+# Page count from which PDFium extraction is split across worker processes
+PARALLEL_MIN_PAGES = 32
 
 
+@functools.lru_cache(maxsize=256)
 def classify_account(name: str | None) -> str | None:
     """Classify an account name into ONLY 'checking' or 'savings'.
 
@@ -106,6 +111,7 @@ def classify_account(name: str | None) -> str | None:
       - "savings"
 
     If heuristics fail to identify a checking keyword, the fallback is "savings".
+    Results are memoized since the same headers repeat across pages.
     """
     if not name:
         return None
@@ -166,16 +172,12 @@ def detect_credit_card(lines: list[str]) -> bool:
     return False
 
 
-def parse_line_credit(
-    line: str,
-    default_year: int | None,
-    account_name: str | None,
-    account_number: str | None,
-    account_type: str | None,
-):
+def parse_line_credit(line: str):
     """Parse a credit-card style transaction line with two dates and a reference.
 
-    Returns a dict compatible with the bank statement parser or None.
+    Returns (row, post_date_raw) where row has the same layout as parse_line's
+    result, or None. Dates are left raw; parse_bank_statement converts them
+    for all rows at once.
     Amount polarity: purchases -> positive (outflow / increase liability), payments & credits -> negative.
     """
     m = CC_TXN_LINE_RX.match(line)
@@ -198,39 +200,29 @@ def parse_line_credit(
         signed_amount = abs(amount)  # reduces liability
     else:
         signed_amount = -abs(amount)  # spending / charges
-    # Date parsing (prefer transaction date as primary)
-    d_primary = parse_date(tdate_raw, default_year, None)
-    return {
-        "date": d_primary,
-        "date_raw": tdate_raw,
-        "post_date": parse_date(pdate_raw, default_year, None),
-        "description": f"{desc} REF:{ref}",
-        "amount": signed_amount,
-        "debit": abs(signed_amount) if signed_amount < 0 else None,
-        "credit": signed_amount if signed_amount > 0 else None,
-        "balance": None,  # typical CC lines do not show running balance here
-        "account_name": account_name,
-        "account_number": account_number,
-        "account_type": account_type or "credit_card",
-        "line_type": "transaction",
-        "raw_line": line,
-    }
+    row = (
+        tdate_raw,
+        f"{desc} REF:{ref}",
+        signed_amount,
+        abs(signed_amount) if signed_amount < 0 else None,
+        signed_amount if signed_amount > 0 else None,
+        None,  # typical CC lines do not show running balance here
+        "transaction",
+    )
+    return row, pdate_raw
 
 
 def infer_year(all_lines: list[str]) -> int | None:
-    years: list[int] = []
-    period_years: list[int] = []
-    for line in all_lines:
-        for m in YEAR_IN_RANGE_RX.finditer(line):
-            y = m.group(1)
-            y_full = int(("20" + y) if len(y) == 2 else y)
-            years.append(y_full)
-        for pm in STATEMENT_PERIOD_RX.finditer(line):
-            y1_raw = pm.group(2)
-            y2_raw = pm.group(4)
-            for y_raw in (y1_raw, y2_raw):
-                y_full = int(("20" + y_raw) if len(y_raw) == 2 else y_raw)
-                period_years.append(y_full)
+    # Neither pattern spans a line break in practice, so scan the whole text in one pass
+    corpus = "\n".join(all_lines)
+    years = [
+        int(("20" + y) if len(y) == 2 else y) for y in YEAR_IN_RANGE_RX.findall(corpus)
+    ]
+    period_years = [
+        int(("20" + y_raw) if len(y_raw) == 2 else y_raw)
+        for _, y1_raw, _, y2_raw in STATEMENT_PERIOD_RX.findall(corpus)
+        for y_raw in (y1_raw, y2_raw)
+    ]
     if not years:
         return None
     counter = Counter(years)
@@ -244,47 +236,16 @@ def infer_year(all_lines: list[str]) -> int | None:
     return counter.most_common(1)[0][0]
 
 
-def normalize_number(raw: str | None) -> float | None:
-    """Parse a currency-like token into a float with sign.
-
-    Heuristics to reduce false positives (e.g. giant reference strings):
-    - Allow optional $, commas, parentheses, trailing minus.
-    - Require at most 2 decimal places when a decimal point is present.
-    - Reject pure integer tokens longer than 7 digits (likely IDs) unless they contain commas.
-    - Reject tokens whose numeric part exceeds 1e9 (configurable cutoff) to avoid absurd values.
-    """
-    if not raw:
-        return None
-    token = raw.strip()
-    neg = False
-    if token.endswith("-") and token.count("-") == 1:
-        neg = True
-        token = token[:-1]
-    if token.startswith("(") and token.endswith(")"):
-        neg = True
-        token = token[1:-1]
-    token_nosym = token.replace("$", "").replace(",", "")
-    if token_nosym.startswith("-"):
-        neg = True
-        token_nosym = token_nosym[1:]
-    core = token_nosym
-    if not re.fullmatch(r"\d+(?:\.\d+)?", core):
-        return None
-    if "." not in core and len(core) > 7:
-        return None
-    if "." in core:
-        int_part, frac_part = core.split(".", 1)
-        if not (1 <= len(frac_part) <= 2):
-            return None
-        if len(frac_part) == 1:
-            core = int_part + "." + frac_part + "0"
-    try:
-        v = float(core)
-    except ValueError:
-        return None
-    if v > 1_000_000_000:
-        return None
-    return -v if neg else v
+DATE_FORMATS = (
+    "%m-%d-%Y",
+    "%m-%d-%y",
+    "%d-%m-%Y",
+    "%d-%m-%y",
+    "%m/%d/%Y",
+    "%m/%d/%y",
+    "%d/%m/%Y",
+    "%d/%m/%y",
+)
 
 
 def parse_date(
@@ -317,16 +278,7 @@ def parse_date(
             return datetime(default_year, month, day).date()
         except ValueError:
             return raw
-    for fmt in (
-        "%m-%d-%Y",
-        "%m-%d-%y",
-        "%d-%m-%Y",
-        "%d-%m-%y",
-        "%m/%d/%Y",
-        "%m/%d/%y",
-        "%d/%m/%Y",
-        "%d/%m/%y",
-    ):
+    for fmt in DATE_FORMATS:
         try:
             return datetime.strptime(raw, fmt).date()
         except ValueError:
@@ -334,16 +286,199 @@ def parse_date(
     return raw
 
 
+_DATE_DTYPE = "datetime64[s]"
+
+
+def parse_dates(
+    raw: pd.Series, default_year: int | None, date_order: str | None = None
+) -> pd.Series:
+    """Vectorized parse_date over a column of raw date strings.
+
+    Applies the same rules as parse_date (year inference and month/day
+    ordering for two-part dates, then DATE_FORMATS in order) with one
+    pd.to_datetime call per rule. Returns a second-resolution datetime64
+    Series with NaT where a value could not be parsed.
+    """
+    # pandas may return ns or us resolution depending on version and input; cast
+    # every partial result to one unit so combining them never overflows ns bounds
+    parsed = pd.Series(pd.NaT, index=raw.index, dtype=_DATE_DTYPE)
+    parts = raw.str.split(r"[/-]", regex=True)
+    two_part = parts.str.len() == 2
+    if default_year and two_part.any():
+        a = pd.to_numeric(parts[two_part].str[0], errors="coerce")
+        b = pd.to_numeric(parts[two_part].str[1], errors="coerce")
+        day_first = (a > 12) & (b <= 12)
+        if date_order == "DM":
+            day_first |= ~((b > 12) & (a <= 12))
+        parsed[two_part] = pd.to_datetime(
+            pd.DataFrame(
+                {
+                    "year": default_year,
+                    "month": b.where(day_first, a),
+                    "day": a.where(day_first, b),
+                }
+            ),
+            errors="coerce",
+        ).astype(_DATE_DTYPE)
+    rest = raw.where(~two_part)
+    for fmt in DATE_FORMATS:
+        parsed = parsed.combine_first(
+            pd.to_datetime(rest, format=fmt, errors="coerce").astype(_DATE_DTYPE)
+        )
+    # pandas < 3 parses at ns resolution and coerces years outside 1677-2262 to NaT;
+    # retry the few three-part dates left over with the scalar parser
+    retry = parsed.isna() & (parts.str.len() == 3)
+    if retry.any():
+        fallback = raw[retry].map(lambda r: parse_date(r, default_year, date_order))
+        fallback = fallback[fallback.map(lambda v: isinstance(v, date))]
+        parsed[fallback.index] = np.array(fallback.tolist(), dtype=_DATE_DTYPE)
+    return parsed
+
+
+def _dates_or_raw(parsed: pd.Series, raw: pd.Series) -> pd.Series:
+    """Return date objects where parsing succeeded, the raw text elsewhere."""
+    return parsed.dt.date.astype(object).where(parsed.notna(), raw)
+
+
 def _normalize_space(s: str) -> str:
     return re.sub(r"[ \t]+", " ", s.replace("\u00a0", " ")).strip()
 
 
+def _text_lines(
+    p_idx: int, text: str, drop_header_footer: bool
+) -> List[Tuple[int, str]]:
+    """Split one page of extracted text into normalized (page, line) tuples."""
+    lines: List[Tuple[int, str]] = []
+    for raw in text.splitlines():
+        s = raw.rstrip()
+        if not s:
+            continue
+        s_norm = _normalize_space(s)
+        if not s_norm:
+            continue
+        if drop_header_footer and any(
+            rx.match(s_norm) for rx in HEADER_FOOTER_PATTERNS_RX
+        ):
+            continue
+        lines.append((p_idx, s_norm))
+    return lines
+
+
+def _pdfium_page_lines(
+    pdf, lo: int, hi: int, drop_header_footer: bool
+) -> List[Tuple[int, str]]:
+    lines: List[Tuple[int, str]] = []
+    for p_idx in range(lo, hi):
+        page = pdf[p_idx]
+        textpage = page.get_textpage()
+        text = textpage.get_text_range()
+        textpage.close()
+        page.close()
+        lines.extend(_text_lines(p_idx + 1, text, drop_header_footer))
+    return lines
+
+
+def _pdfium_extract_range(
+    path, lo: int, hi: int, drop_header_footer: bool
+) -> List[Tuple[int, str]]:
+    """Worker entry point; PDFium handles cannot be pickled, so each worker reopens the file.
+
+    Each worker process runs one task at a time, so no lock is needed here.
+    """
+    pdf = pdfium.PdfDocument(path)
+    try:
+        return _pdfium_page_lines(pdf, lo, hi, drop_header_footer)
+    finally:
+        pdf.close()
+
+
+def _extract_lines_pdfium(
+    pdf_file, drop_header_footer: bool
+) -> List[Tuple[int, str]]:
+    """Extract page text with PDFium, whose C++ text layer is much faster than pdfplumber's.
+
+    Long documents given by path are split into page ranges extracted in
+    parallel worker processes; results are concatenated in page order.
+    """
+    with _PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(pdf_file)
+        try:
+            n_pages = len(pdf)
+            workers = min(os.cpu_count() or 1, n_pages)
+            if (
+                n_pages < PARALLEL_MIN_PAGES
+                or workers < 2
+                or not isinstance(pdf_file, (str, os.PathLike))
+            ):
+                return _pdfium_page_lines(pdf, 0, n_pages, drop_header_footer)
+        finally:
+            pdf.close()
+    step = -(-n_pages // workers)
+    # Spawn rather than fork: the API and Streamlit are multi-threaded, and a forked
+    # child could inherit PDFium mid-call from a thread holding _PDFIUM_LOCK
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        futures = [
+            pool.submit(
+                _pdfium_extract_range,
+                pdf_file,
+                lo,
+                min(lo + step, n_pages),
+                drop_header_footer,
+            )
+            for lo in range(0, n_pages, step)
+        ]
+        lines: List[Tuple[int, str]] = []
+        for fut in futures:
+            lines.extend(fut.result())
+    return lines
+
+
+def _extract_lines_pdfplumber(
+    pdf_file, mode: str, drop_header_footer: bool
+) -> List[Tuple[int, str]]:
+    lines: List[Tuple[int, str]] = []
+    with pdfplumber.open(pdf_file) as pdf:
+        for p_idx, page in enumerate(pdf.pages, start=1):
+            if mode == "raw":
+                lines.extend(
+                    _text_lines(p_idx, page.extract_text() or "", drop_header_footer)
+                )
+            else:
+                words = page.extract_words() or []
+                grouped = []
+                y_tol = 3
+                for w in sorted(words, key=lambda w: (w["top"], w["x0"])):
+                    if not grouped:
+                        grouped.append([w])
+                        continue
+                    last_line = grouped[-1]
+                    if abs(w["top"] - last_line[0]["top"]) <= y_tol:
+                        last_line.append(w)
+                    else:
+                        grouped.append([w])
+                for group in grouped:
+                    group_sorted = sorted(group, key=lambda w: w["x0"])
+                    text_line = " ".join(g["text"] for g in group_sorted)
+                    s_norm = _normalize_space(text_line)
+                    if not s_norm:
+                        continue
+                    if drop_header_footer and any(
+                        rx.match(s_norm) for rx in HEADER_FOOTER_PATTERNS_RX
+                    ):
+                        continue
+                    lines.append((p_idx, s_norm))
+    return lines
+
+
 def extract_raw_lines(
     pdf_file,
     mode: str = "raw",
     merge_wrapped: bool = True,
     include_coords: bool = False,
     drop_header_footer: bool = True,
+    backend: str = "pdfplumber",
 ) -> List[Tuple[int, str]]:
     """
     Extract lines from a PDF.
@@ -353,99 +488,56 @@ def extract_raw_lines(
         merge_wrapped: attempt to merge continuation lines (long descriptions)
         include_coords: if True and mode="words", attaches coords internally (still returns (page, text) outward)
         drop_header_footer: drop lines matching known header/footer regexes
+        backend: "pdfplumber" (rebuilds lines by position) or "pdfium" (fast C++
+            text layer, raw mode only). PDFium returns text in content-stream
+            order, so tables drawn column by column come out as one line per column.
 
     Returns:
         List[(page_number, line_text)]
     """
-    lines: List[Tuple[int, str]] = []
     try:
-        with pdfplumber.open(pdf_file) as pdf:
-            for p_idx, page in enumerate(pdf.pages, start=1):
-                if mode == "raw":
-                    text = page.extract_text() or ""
-                    for raw in text.splitlines():
-                        s = raw.rstrip()
-                        if not s:
-                            continue
-                        s_norm = _normalize_space(s)
-                        if not s_norm:
-                            continue
-                        if drop_header_footer and any(
-                            rx.match(s_norm) for rx in HEADER_FOOTER_PATTERNS_RX
-                        ):
-                            continue
-                        lines.append((p_idx, s_norm))
-                else:
-                    words = page.extract_words() or []
-                    grouped = []
-                    y_tol = 3
-                    for w in sorted(words, key=lambda w: (w["top"], w["x0"])):
-                        if not grouped:
-                            grouped.append([w])
-                            continue
-                        last_line = grouped[-1]
-                        if abs(w["top"] - last_line[0]["top"]) <= y_tol:
-                            last_line.append(w)
-                        else:
-                            grouped.append([w])
-                    for group in grouped:
-                        group_sorted = sorted(group, key=lambda w: w["x0"])
-                        text_line = " ".join(g["text"] for g in group_sorted)
-                        s_norm = _normalize_space(text_line)
-                        if not s_norm:
-                            continue
-                        if drop_header_footer and any(
-                            rx.match(s_norm) for rx in HEADER_FOOTER_PATTERNS_RX
-                        ):
-                            continue
-                        lines.append((p_idx, s_norm))
+        if mode == "raw" and backend == "pdfium":
+            lines = _extract_lines_pdfium(pdf_file, drop_header_footer)
+        else:
+            lines = _extract_lines_pdfplumber(pdf_file, mode, drop_header_footer)
     except Exception:
         return []
 
     if merge_wrapped and lines:
+        # Collect each logical line's fragments and join once when it is flushed
         merged: List[Tuple[int, str]] = []
-        date_prefix = re.compile(r"^\d{1,2}[/-]\d{1,2}(?:[/-]\d{2,4})?\b")
+        cur_pg: int = lines[0][0]
+        cur_parts: list[str] = []
+        # Lines starting with a date or carrying an account header never absorb continuations
+        cur_closed = True
         for pg, text in lines:
-            if not merged:
-                merged.append((pg, text))
-                continue
-            prev_pg, prev_text = merged[-1]
-            prev_starts_with_date = bool(date_prefix.match(prev_text))
-            curr_starts_with_date = bool(date_prefix.match(text))
-            prev_has_header = bool(ACCOUNT_HEADER_INLINE_RX.search(prev_text))
-            curr_has_header = bool(ACCOUNT_HEADER_INLINE_RX.search(text))
+            starts_with_date = bool(_DATE_PREFIX_RX.match(text))
+            has_header = "-" in text and bool(ACCOUNT_HEADER_INLINE_RX.search(text))
             if (
-                pg == prev_pg
-                and not prev_starts_with_date
-                and not curr_starts_with_date
-                and not prev_has_header
-                and not curr_has_header
+                cur_parts
+                and pg == cur_pg
+                and not cur_closed
+                and not starts_with_date
+                and not has_header
             ):
-                merged[-1] = (prev_pg, prev_text + " " + text)
-            else:
-                merged.append((pg, text))
+                cur_parts.append(text)
+                continue
+            if cur_parts:
+                merged.append((cur_pg, " ".join(cur_parts)))
+            cur_pg, cur_parts = pg, [text]
+            cur_closed = starts_with_date or has_header
+        merged.append((cur_pg, " ".join(cur_parts)))
         lines = merged
 
     return lines
 
 
-def should_skip_desc(desc: str) -> bool:
-    if desc in SKIP_DESC:
-        return True
-    for frag in SKIP_CONTAINS:
-        if frag in desc:
-            return True
-    return False
-
+def parse_line(line: str):
+    """Parse a dated statement line.
 
-def parse_line(
-    line: str,
-    default_year: int | None,
-    account_name: str | None,
-    account_number: str | None,
-    account_type: str | None = None,
-    date_order: str | None = None,
-):
+    Returns (date_raw, description, amount, debit, credit, balance, line_type)
+    or None. The caller attaches the current account context.
+    """
     m = DATE_START_RX.match(line)
     if not m:
         return None
@@ -471,127 +563,45 @@ def parse_line(
         elif len(trailing) >= 2:  # sometimes an extra reference then amount
             # try last token
             bal_val = normalize_number(trailing[-1])
-        return {
-            "date": parse_date(date_raw, default_year, date_order),
-            "date_raw": date_raw,
-            "description": description,
-            "amount": None,
-            "debit": None,
-            "credit": None,
-            "balance": bal_val,
-            "account_name": account_name,
-            "account_number": account_number,
-            "account_type": account_type,
-            "line_type": "marker",
-            "raw_line": line,
-        }
-
-    amount = balance = None
-    debit = credit = None
-
-    if len(trailing) == 3:
-        ref_candidate = trailing[0]
-        monetary_tail = trailing[1:]
+        return (date_raw, description, None, None, None, bal_val, "marker")
 
-        def _looks_money(tok: str) -> bool:
-            return bool(re.search(r"[().-]", tok)) or "." in tok
-
-        if (
-            ref_candidate.isdigit()
-            and len(ref_candidate) >= 5
-            and "." not in ref_candidate
-            and any(_looks_money(t) for t in monetary_tail)
-        ):
-            description = (description + " " + ref_candidate).strip()
-            trailing = trailing[1:]
-    if len(trailing) == 3:
-        a1 = normalize_number(trailing[0])
-        a2 = normalize_number(trailing[1])
-        b = normalize_number(trailing[2])
-        if a1 is not None and a2 is not None and b is not None:
-            if (a1 < 0 < a2) or (a2 < 0 < a1):
-                debit = abs(a1) if a1 < 0 else abs(a2) if a2 < 0 else None
-                credit = a1 if a1 > 0 else a2 if a2 > 0 else None
-                amount = (credit or 0) - (debit or 0)
-                balance = b
-            else:
-                amount = a1
-                balance = b
-        elif a1 is not None and b is not None:
-            amount = a1
-            balance = b
-    elif len(trailing) == 2:
-        t0, t1 = trailing
-        looks_ref = t0.isdigit() and len(t0) >= 5 and "." not in t0
-        looks_money = bool(re.search(r"[().-]", t1) or "." in t1)
-        if looks_ref and looks_money:
-            description = (description + " " + t0).strip()
-            trailing = [t1]
-            a1 = normalize_number(trailing[0])
-            if a1 is not None and not (trailing[0].isdigit() and len(trailing[0]) > 8):
-                amount = a1
-        else:
-            a1 = normalize_number(t0)
-            a2 = normalize_number(t1)
-            if a1 is not None and a2 is not None:
-                if (abs(a2) >= abs(a1)) or ("," in t1 and "," not in t0):
-                    amount = a1
-                    balance = a2
-                else:
-                    amount = a1
-            elif a1 is not None:
-                amount = a1
-            elif a2 is not None:
-                amount = a2
-    elif len(trailing) == 1:
-        a1 = normalize_number(trailing[0])
-        if a1 is not None and not (trailing[0].isdigit() and len(trailing[0]) > 8):
-            amount = a1
-        else:
-            if trailing[0]:
-                description = (description + " " + trailing[0]).strip()
-
-    if amount is not None and debit is None and credit is None:
-        if amount < 0:
-            debit = -amount
-        elif amount > 0:
-            credit = amount
+    description, amount, debit, credit, balance = classify_trailing(
+        description, trailing
+    )
 
     if all(v is None for v in (amount, balance, debit, credit)):
         return None
 
-    line_type = "transaction"
-
-    return {
-        "date": parse_date(date_raw, default_year, date_order),
-        "date_raw": date_raw,
-        "description": description,
-        "amount": amount,
-        "debit": debit,
-        "credit": credit,
-        "balance": balance,
-        "account_name": account_name,
-        "account_number": account_number,
-        "account_type": account_type,
-        "line_type": line_type,
-        "raw_line": line,
-    }
+    return (date_raw, description, amount, debit, credit, balance, "transaction")
 
 
 def parse_bank_statement(
-    pdf_file,
+    pdf_file, backend: str = "pdfplumber"
 ) -> tuple[pd.DataFrame, list[str], List[Tuple[int, str]]]:
-    raw_lines = extract_raw_lines(pdf_file)
+    raw_lines = extract_raw_lines(pdf_file, backend=backend)
     default_year = infer_year([line_text for _, line_text in raw_lines])
-    rows = []
     unparsed: list[str] = []
     account_name = account_number = account_type = None
     credit_card_mode = detect_credit_card([line_text for _, line_text in raw_lines])
 
+    # One list per output column; rows are appended as scalars
+    dates_raw: list = []
+    post_dates: list = []
+    descriptions: list = []
+    amounts: list = []
+    debits: list = []
+    credits: list = []
+    balances: list = []
+    account_names: list = []
+    account_numbers: list = []
+    account_types: list = []
+    line_types: list = []
+    raw_texts: list = []
+    row_cols = (dates_raw, descriptions, amounts, debits, credits, balances, line_types)
+
     for pg, line in raw_lines:
-        hdr = ACCOUNT_HEADER_RX.match(line)
-        if not hdr:
-            hdr = ACCOUNT_HEADER_INLINE_RX.search(line)
+        # Every header contains a hyphen; the substring test skips the regex for most lines
+        hdr = ACCOUNT_HEADER_INLINE_RX.search(line) if "-" in line else None
         if hdr:
             account_name = hdr.group("name").strip()
             account_number = hdr.group("number")
@@ -599,49 +609,86 @@ def parse_bank_statement(
         # Skip pure date range lines (statement period headers) so they don't clutter unparsed
         if DATE_RANGE_RX.match(line):
             continue
+        rec = None
+        post_date = None
+        row_account_type = account_type
         if credit_card_mode:
-            rec = parse_line_credit(
-                line,
-                default_year,
-                account_name,
-                account_number,
-                account_type or "credit_card",
-            )
-            if not rec:
-                # fall back to bank line parse in case of marker lines we already support
-                rec = parse_line(
-                    line,
-                    default_year,
-                    account_name,
-                    account_number,
-                    account_type,
-                )
-        else:
-            rec = parse_line(
-                line, default_year, account_name, account_number, account_type
-            )
-        if rec:
-            rows.append(rec)
-        else:
-            if re.match(r"^\d{1,2}[/-]\d{1,2}\b", line):
+            cc = parse_line_credit(line)
+            if cc:
+                rec, post_date = cc
+                row_account_type = account_type or "credit_card"
+        if rec is None:
+            # bank line parse; in credit card mode this picks up marker lines we already support
+            rec = parse_line(line)
+        if rec is None:
+            if _DATE_PREFIX_RX.match(line):
                 unparsed.append(f"[p{pg}] {line}")
-    df = pd.DataFrame(rows)
+            continue
+        for col, value in zip(row_cols, rec):
+            col.append(value)
+        post_dates.append(post_date)
+        account_names.append(account_name)
+        account_numbers.append(account_number)
+        account_types.append(row_account_type)
+        raw_texts.append(line)
+
+    # Sort once on the column lists (account type, account number, parsed date; missing
+    # values last) so the frame is built in final order.
+    parsed_dates = parse_dates(pd.Series(dates_raw, dtype=object), default_year)
+    date_missing = parsed_dates.isna().tolist()
+    date_keys = parsed_dates.to_numpy().astype("int64").tolist()
+    order = sorted(
+        range(len(dates_raw)),
+        key=lambda i: (
+            account_types[i] is None,
+            account_types[i] or "",
+            account_numbers[i] is None,
+            account_numbers[i] or "",
+            date_missing[i],
+            date_keys[i],
+        ),
+    )
+    parsed_dates = parsed_dates.iloc[order].reset_index(drop=True)
+
+    def _ordered(col: list) -> list:
+        return [col[i] for i in order]
+
+    columns: dict[str, list] = {"date_raw": _ordered(dates_raw)}
+    if any(p is not None for p in post_dates):
+        columns["post_date"] = _ordered(post_dates)
+    columns.update(
+        {
+            "description": _ordered(descriptions),
+            "amount": _ordered(amounts),
+            "debit": _ordered(debits),
+            "credit": _ordered(credits),
+            "balance": _ordered(balances),
+            "account_name": _ordered(account_names),
+            "account_number": _ordered(account_numbers),
+            "account_type": _ordered(account_types),
+            "line_type": _ordered(line_types),
+            "raw_line": _ordered(raw_texts),
+        }
+    )
+    df = pd.DataFrame(columns)
+    # Inserted even when no rows parsed, so empty results share the full schema
+    df.insert(0, "date", _dates_or_raw(parsed_dates, df["date_raw"]))
     if not df.empty:
+        if "post_date" in df.columns:
+            df["post_date"] = _dates_or_raw(
+                parse_dates(df["post_date"], default_year), df["post_date"]
+            )
         try:
-            df["_d"] = pd.to_datetime(df["date"], errors="coerce")
-            sort_cols = [
-                c for c in ["account_type", "account_number", "_d"] if c in df.columns
-            ]
-            df = df.sort_values(sort_cols).drop(columns=["_d"])
-            if "amount" in df.columns:
-                amt_series = df["amount"].dropna()
-                if not amt_series.empty:
-                    med = amt_series.abs().median()
-                    if med > 0:
-                        cutoff = med * 50  # generous multiplier
-                        df.loc[
-                            df["amount"].abs() > cutoff, ["amount", "debit", "credit"]
-                        ] = None
+            amt_series = df["amount"].dropna()
+            if not amt_series.empty:
+                med = amt_series.abs().median()
+                if med > 0:
+                    cutoff = med * 50  # generous multiplier
+                    df.loc[
+                        df["amount"].abs() > cutoff, ["amount", "debit", "credit"]
+                    ] = None
+            # Drop rows left without any figure: balance-less Beginning/Ending Balance
+            # markers, and outliers blanked above that had no balance
             mask_all_none = (
                 df[["amount", "debit", "credit", "balance"]].isna().all(axis=1)
             )
@@ -691,38 +738,30 @@ def compute_balance_mismatches(df: pd.DataFrame, tolerance: float = 0.01) -> lis
     """Return list of mismatches where provided balance != prior balance + amount.
 
     Requires columns: date, amount, balance, account_number, line_type.
+    The prior balance is the one printed on the previous row of the same
+    account; rows after a line without a balance are therefore not checked.
     """
-    mismatches: list[dict] = []
     if df.empty:
-        return mismatches
-    for acct, g in df.sort_values(["account_number", "date_raw"]).groupby(
-        "account_number", dropna=False
-    ):
-        last_balance = None
-        for idx, row in g.iterrows():
-            if row.get("line_type") == "marker":
-                if row.get("balance") is not None:
-                    last_balance = row["balance"]
-                continue
-            amount = row.get("amount")
-            bal = row.get("balance")
-            if amount is not None and bal is not None and last_balance is not None:
-                expected = round(last_balance + amount, 2)
-                provided = round(bal, 2)
-                if abs(expected - provided) > tolerance:
-                    mismatches.append(
-                        {
-                            "index": idx,
-                            "account_number": acct,
-                            "date": row.get("date"),
-                            "description": row.get("description"),
-                            "amount": amount,
-                            "prev_balance": last_balance,
-                            "expected_balance": expected,
-                            "provided_balance": provided,
-                            "delta": round(provided - expected, 2),
-                        }
-                    )
-            if bal is not None:
-                last_balance = bal
-    return mismatches
+        return []
+    g = df.sort_values(["account_number", "date_raw"])
+    balance = g["balance"].astype(float)
+    prev_balance = balance.groupby(g["account_number"], dropna=False).shift()
+    expected = (prev_balance + g["amount"].astype(float)).round(2)
+    provided = balance.round(2)
+    # NaN on either side compares False, so rows missing a figure drop out here
+    bad = (g["line_type"] != "marker") & ((expected - provided).abs() > tolerance)
+    if not bad.any():
+        return []
+    return pd.DataFrame(
+        {
+            "index": g.index[bad],
+            "account_number": g["account_number"][bad].to_numpy(),
+            "date": g["date"][bad].to_numpy(),
+            "description": g["description"][bad].to_numpy(),
+            "amount": g["amount"][bad].to_numpy(),
+            "prev_balance": prev_balance[bad].to_numpy(),
+            "expected_balance": expected[bad].to_numpy(),
+            "provided_balance": provided[bad].to_numpy(),
+            "delta": (provided - expected)[bad].round(2).to_numpy(),
+        }
+    ).to_dict(orient="records")
@@ -0,0 +1,146 @@
+"""Scalar per-token kernels of the statement parser.
+
+Kept free of pandas/pdfplumber and fully annotated so the module can be
+compiled with mypyc (see README). When no compiled extension is present
+Python imports this source file instead, so the compiled build is optional.
+"""
+
+import re
+
+_MONEY_HINT_RX = re.compile(r"[().-]")
+_CURRENCY_STRIP = str.maketrans("", "", "$,")
+
+
+SKIP_DESC = frozenset(["Beginning Balance", "Ending Balance"])
+SKIP_CONTAINS = ["Average Daily Balance", "Beginning Balnce", "Ending Balance"]
+# All SKIP_CONTAINS fragments in one alternation, checked in a single scan
+_SKIP_CONTAINS_RX = re.compile("|".join(map(re.escape, SKIP_CONTAINS)))
+
+
+def normalize_number(raw: str | None) -> float | None:
+    """Parse a currency-like token into a float with sign.
+
+    Heuristics to reduce false positives (e.g. giant reference strings):
+    - Allow optional $, commas, parentheses, trailing minus.
+    - Require at most 2 decimal places when a decimal point is present.
+    - Reject pure integer tokens longer than 7 digits (likely IDs) unless they contain commas.
+    - Reject tokens whose numeric part exceeds 1e9 (configurable cutoff) to avoid absurd values.
+    """
+    if not raw:
+        return None
+    token = raw.strip()
+    neg = False
+    if token.endswith("-") and token.count("-") == 1:
+        neg = True
+        token = token[:-1]
+    if token.startswith("(") and token.endswith(")"):
+        neg = True
+        token = token[1:-1]
+    # Drop currency symbols and thousands separators in a single C pass
+    core = token.translate(_CURRENCY_STRIP)
+    if core.startswith("-"):
+        neg = True
+        core = core[1:]
+    int_part, dot, frac_part = core.partition(".")
+    if not int_part.isdigit():
+        return None
+    if not dot and len(core) > 7:
+        return None
+    if dot and not (frac_part.isdigit() and len(frac_part) <= 2):
+        return None
+    try:
+        v = float(core)
+    except ValueError:
+        return None
+    if v > 1_000_000_000:
+        return None
+    return -v if neg else v
+
+
+def _looks_money(tok: str) -> bool:
+    return bool(_MONEY_HINT_RX.search(tok)) or "." in tok
+
+
+def should_skip_desc(desc: str) -> bool:
+    return desc in SKIP_DESC or _SKIP_CONTAINS_RX.search(desc) is not None
+
+
+def classify_trailing(
+    description: str, trailing: list[str]
+) -> tuple[str, float | None, float | None, float | None, float | None]:
+    """Interpret the numeric tokens trailing a transaction description.
+
+    Returns (description, amount, debit, credit, balance). Tokens that look like
+    reference numbers rather than money are folded back into the description.
+    """
+    amount: float | None = None
+    balance: float | None = None
+    debit: float | None = None
+    credit: float | None = None
+
+    if len(trailing) == 3:
+        ref_candidate = trailing[0]
+        monetary_tail = trailing[1:]
+
+        if (
+            ref_candidate.isdigit()
+            and len(ref_candidate) >= 5
+            and "." not in ref_candidate
+            and any(_looks_money(t) for t in monetary_tail)
+        ):
+            description = (description + " " + ref_candidate).strip()
+            trailing = trailing[1:]
+    if len(trailing) == 3:
+        a1 = normalize_number(trailing[0])
+        a2 = normalize_number(trailing[1])
+        b = normalize_number(trailing[2])
+        if a1 is not None and a2 is not None and b is not None:
+            if (a1 < 0 < a2) or (a2 < 0 < a1):
+                debit = abs(a1) if a1 < 0 else abs(a2) if a2 < 0 else None
+                credit = a1 if a1 > 0 else a2 if a2 > 0 else None
+                amount = (credit or 0) - (debit or 0)
+                balance = b
+            else:
+                amount = a1
+                balance = b
+        elif a1 is not None and b is not None:
+            amount = a1
+            balance = b
+    elif len(trailing) == 2:
+        t0, t1 = trailing
+        looks_ref = t0.isdigit() and len(t0) >= 5 and "." not in t0
+        looks_money = bool(_MONEY_HINT_RX.search(t1) or "." in t1)
+        if looks_ref and looks_money:
+            description = (description + " " + t0).strip()
+            trailing = [t1]
+            a1 = normalize_number(trailing[0])
+            if a1 is not None and not (trailing[0].isdigit() and len(trailing[0]) > 8):
+                amount = a1
+        else:
+            a1 = normalize_number(t0)
+            a2 = normalize_number(t1)
+            if a1 is not None and a2 is not None:
+                if (abs(a2) >= abs(a1)) or ("," in t1 and "," not in t0):
+                    amount = a1
+                    balance = a2
+                else:
+                    amount = a1
+            elif a1 is not None:
+                amount = a1
+            elif a2 is not None:
+                amount = a2
+    elif len(trailing) == 1:
+        a1 = normalize_number(trailing[0])
+        if a1 is not None and not (trailing[0].isdigit() and len(trailing[0]) > 8):
+            amount = a1
+        else:
+            if trailing[0]:
+                description = (description + " " + trailing[0]).strip()
+
+    if amount is not None and debit is None and credit is None:
+        if amount < 0:
+            debit = -amount
+        elif amount > 0:
+            credit = amount
+
+    return description, amount, debit, credit, balance
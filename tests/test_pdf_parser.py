@@ -0,0 +1,48 @@
+from datetime import date
+
+import pandas as pd
+
+import pdf_parser
+
+
+def test_parse_dates_handles_years_outside_nanosecond_range():
+    raw = pd.Series(["12/31/9999", "01/02/2024", "01/03", "02/30"])
+    parsed = pdf_parser.parse_dates(raw, 2024)
+    assert list(pdf_parser._dates_or_raw(parsed, raw)) == [
+        date(9999, 12, 31),
+        date(2024, 1, 2),
+        date(2024, 1, 3),
+        "02/30",
+    ]
+
+
+def test_parse_bank_statement_out_of_range_year(monkeypatch):
+    lines = [
+        (1, "Premier Checking - 12345678"),
+        (1, "01/02/2024 COFFEE SHOP 4.50- 1,100.00"),
+        (1, "12/31/9999 HOLD RELEASE 5.00 1,105.00"),
+    ]
+    monkeypatch.setattr(pdf_parser, "extract_raw_lines", lambda pdf_file, **kwargs: lines)
+    df, unparsed, _ = pdf_parser.parse_bank_statement("statement.pdf")
+    assert unparsed == []
+    assert list(df["date"]) == [date(2024, 1, 2), date(9999, 12, 31)]
+
+
+def test_parse_bank_statement_drops_marker_without_balance(monkeypatch):
+    lines = [
+        (1, "Premier Checking - 12345678"),
+        (1, "01/01/2024 Beginning Balance"),
+        (1, "01/02/2024 COFFEE SHOP 4.50- 1,095.50"),
+        (1, "01/03/2024 DEPOSIT 100.00 1,195.50"),
+    ]
+    monkeypatch.setattr(pdf_parser, "extract_raw_lines", lambda pdf_file, **kwargs: lines)
+    df, _, _ = pdf_parser.parse_bank_statement("statement.pdf")
+    assert list(df["description"]) == ["COFFEE SHOP", "DEPOSIT"]
+
+
+def test_parse_bank_statement_empty_result_keeps_columns(monkeypatch):
+    lines = [(1, "Premier Checking - 12345678"), (1, "No activity this period")]
+    monkeypatch.setattr(pdf_parser, "extract_raw_lines", lambda pdf_file, **kwargs: lines)
+    df, _, _ = pdf_parser.parse_bank_statement("statement.pdf")
+    assert df.empty
+    assert list(df.columns[:3]) == ["date", "date_raw", "description"]